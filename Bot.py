@@ -28,6 +28,8 @@ from telegram.ext import (
 import google.generativeai as genai
 from google.generativeai import types
 
+from dialog_packs import load_dialog_packs, normalize_language_code, select_dialog, clip_position, infer_tone
+
 
 # -------------------------------------------------
 #  Logging & Config
@@ -52,6 +54,9 @@ if GEMINI_API_KEY:
 else:
     logger.warning("GEMINI_API_KEY not found. Using fallback concepts only.")
 
+# Example dialog packs (dialog_data/*.json), indexed once at startup
+DIALOG_INDEX = load_dialog_packs()
+
 
 # -------------------------------------------------
 #  States for ConversationHandler (FIXED: Starting from 100 to avoid 0/1 conflicts)
@@ -99,55 +104,9 @@ def split_to_segments(duration_sec: int) -> list[int]:
     return segments
 
 
-def build_example_dialog(language: str, market: str, brand: str):
-    """Provides short example dialog lines for tone consistency."""
-    
-    # Hebrew HE
-    if language.upper() == "HE":
-        templates = [
-            [
-                f'"אוקיי, בדיקה מהירה... מה יש היום בכדורגל?"',
-                f'"וואו, {brand} שם לי הכל מסודר במקום אחד."',
-                f'"אפשר לעשות את זה בשנייה ולחזור למה שעשיתי."',
-            ],
-            [
-                f'"רגע, בוא נראה מה ה-Live Score."',
-                f'"יפה, האפליקציה כבר עדכנה. {brand} פשוט מהיר."',
-                f'"טוב, מוכן לחצי השני עכשיו."',
-            ],
-        ]
-        return random.choice(templates)
-
-    # Spanish ES (Genérico)
-    if "ES" in language.upper():
-        templates = [
-            [
-                f'"A ver, chequeo rápido... qué hay de fútbol hoy en {market}?"',
-                f'"Wow, {brand} me pone todo en un solo lugar."',
-                f'"Puedo hacer esto en segundos y volver a lo que estaba haciendo."',
-            ],
-            [
-                f'"Espera, déjame ver el marcador en vivo."',
-                f'"Buena, la app ya actualizó. {brand} nunca duerme."',
-                f'"Listo, ya estoy para el segundo tiempo."',
-            ],
-        ]
-        return random.choice(templates)
-        
-    # Default English EN
-    templates = [
-        [
-            f'"Ok, quick check... what are today matches in {market}?"',
-            f'"Wow, {brand} has everything in one place."',
-            '"I can do this in a few seconds and get back to what I was doing."',
-        ],
-        [
-            '"Hold on, let me see the live score."',
-            f'"Nice, the app updated already. {brand} never sleeps."',
-            '"Alright, I am ready for the second half now."',
-        ],
-    ]
-    return random.choice(templates)
+def build_example_dialog(language_code: str, market: str, brand: str, position: str = "middle", tone: str = ""):
+    """Provides short example dialog lines for tone consistency, from the preloaded dialog packs."""
+    return select_dialog(DIALOG_INDEX, language_code, brand, market, position, tone)
 
 
 def get_fallback_concepts(mode: str, count: int) -> Dict[int, Dict[str, str]]:
@@ -265,6 +224,7 @@ def build_veo_prompts(user_data: Dict[str, Any]) -> str:
     scene = user_data.get("scene_concept", "Natural fan reaction to a match moment.")
     actor = user_data.get("actor_desc", "a young, excited football fan.")
     length = user_data["video_length"]
+    language_code = user_data.get("language_code") or normalize_language_code(language, market)
 
     segments = split_to_segments(length)
     variations = 4
@@ -296,14 +256,17 @@ def build_veo_prompts(user_data: Dict[str, Any]) -> str:
                 "a clear call to action inviting the viewer to download or play with the brand name {brand} visible on screen",
                 "natural fan behavior, using a quick, dynamic camera movement in the background",
             ])
-            example_dialog = build_example_dialog(language, market, brand)
+            position = clip_position(s_idx, len(segments))
+            tone = infer_tone(focus, style, scene)
+            example_dialog = build_example_dialog(language_code, market, brand, position, tone)
 
             full_output_lines.append(f"--- CLIP {s_idx + 1} of {len(segments)} ({seg_len} SECONDS) ---")
             full_output_lines.append(f"1. VISUAL: Vertical 9:16. The {actor} in the {market} setting. Action should focus on: {focus}.")
             full_output_lines.append(f"2. DIALOG ({language}): Write the full spoken script for this clip. Must fit in {seg_len} seconds.")
-            full_output_lines.append(f"   Example script lines for tone:")
-            for d in example_dialog:
-                full_output_lines.append(f"   {d}")
+            if example_dialog:
+                full_output_lines.append(f"   Example script lines for tone:")
+                for d in example_dialog:
+                    full_output_lines.append(f"   {d}")
             full_output_lines.append("")
 
         # Whisk Frame 1 Prompt
@@ -446,6 +409,9 @@ async def ask_style(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         context.user_data["language"] = text_input.split("(")[1].split(")")[0].strip()
     else:
         context.user_data["language"] = text_input
+    context.user_data["language_code"] = normalize_language_code(
+        context.user_data["language"], context.user_data.get("market", "")
+    )
     
     await update.message.reply_text("OK. Please describe the creative style (UGC selfie, motion graphic, clean banner, etc.)", 
                                     reply_markup=ReplyKeyboardRemove())
@@ -0,0 +1,44 @@
+"""
+Benchmark: per-clip example dialog selection cost.
+
+Run: python bench_dialog.py
+Compares select_dialog() on the preloaded index against a synthetic pack
+100x larger, to show selection cost doesn't grow with pack size.
+"""
+import timeit
+
+from dialog_packs import DialogIndex, load_dialog_packs, normalize_language_code, select_dialog
+
+CALLS = 100_000
+
+
+def inflate(index: DialogIndex, factor: int) -> DialogIndex:
+    return {key: pool * factor for key, pool in index.items()}
+
+
+def bench(label: str, index: DialogIndex, language_code: str, position: str, tone: str = "") -> None:
+    seconds = timeit.timeit(
+        lambda: select_dialog(index, language_code, "betsson", "argentina", position, tone),
+        number=CALLS,
+    )
+    print(f"{label:<40} {seconds / CALLS * 1e6:8.2f} us/clip")
+
+
+def main():
+    index = load_dialog_packs()
+    big_index = inflate(index, 100)
+
+    for language in ("English", "Spanish", "Hebrew", "Portuguese", "Klingon"):
+        code = normalize_language_code(language, "argentina")
+        bench(f"{language} -> {code} (packs)", index, code, "opening")
+        bench(f"{language} -> {code} (packs x100)", big_index, code, "opening")
+
+    bench("ES-AR closing, tone=urgent", index, "ES-AR", "closing", "urgent")
+    bench("ES-PE middle (locale fallback)", index, "ES-PE", "middle")
+
+    seconds = timeit.timeit(lambda: normalize_language_code("Spanish (Argentina)"), number=CALLS)
+    print(f"{'normalize_language_code':<40} {seconds / CALLS * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
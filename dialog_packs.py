@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import random
+import re
+from string import Formatter
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DIALOG_PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dialog_data")
+DEFAULT_LANGUAGE_CODE = "EN"
+POSITIONS = ("opening", "middle", "closing")
+PLACEHOLDERS = ("brand", "market")
+
+# Unicode bidi isolates: RLI ... PDI keeps an RTL line intact inside the LTR prompt,
+# LRI ... PDI keeps Latin brand/market names from being reordered inside an RTL line.
+RLI = "\u2067"
+LRI = "\u2066"
+PDI = "\u2069"
+
+# Short language codes -> base code. Only matched as the whole input or the "xx-YY" head,
+# since many of them ("en", "he", "por") are everyday words.
+LANGUAGE_CODES: Dict[str, str] = {
+    "en": "EN", "eng": "EN",
+    "es": "ES", "spa": "ES",
+    "he": "HE", "iw": "HE", "heb": "HE",
+    "pt": "PT", "por": "PT",
+}
+
+# Full language names (as typed in the bot or shown on its buttons) -> base code.
+# These are also matched word by word inside longer text.
+LANGUAGE_NAMES: Dict[str, str] = {
+    "english": "EN", "english for the market": "EN", "inglés": "EN", "ingles": "EN",
+    "spanish": "ES", "español": "ES", "espanol": "ES", "castellano": "ES",
+    "hebrew": "HE", "ivrit": "HE", "עברית": "HE",
+    "portuguese": "PT", "português": "PT", "portugues": "PT",
+}
+LANGUAGE_ALIASES: Dict[str, str] = {**LANGUAGE_CODES, **LANGUAGE_NAMES}
+KNOWN_LANGUAGE_CODES = frozenset(LANGUAGE_ALIASES.values())
+
+# Free-text region names (from the language text or the market) -> ISO region code.
+REGION_ALIASES: Dict[str, str] = {
+    "argentina": "AR", "ar": "AR",
+    "peru": "PE", "perú": "PE", "pe": "PE",
+    "israel": "IL", "ישראל": "IL", "il": "IL",
+    "south africa": "ZA", "za": "ZA",
+    "brazil": "BR", "brasil": "BR", "br": "BR",
+    "portugal": "PT",
+    "spain": "ES", "españa": "ES",
+    "mexico": "MX", "méxico": "MX", "mx": "MX",
+}
+
+# Word prefixes in the creative style / scene concept -> dialog tone
+TONE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "urgent": ("cta", "call to action", "download", "install", "promo", "offer", "bonus", "limited"),
+    "excited": ("excited", "reaction", "celebrat", "goal", "hype", "energetic", "cheer", "scream", "wow"),
+}
+
+# Type alias: (language code, region or "", position, tone or "") -> list of (lines, rtl)
+DialogIndex = Dict[Tuple[str, str, str, str], List[Tuple[Tuple[str, ...], bool]]]
+
+
+def normalize_language_code(language: str, market: str = "") -> str:
+    """
+    Normalizes free-text language input ("Spanish", "es_AR", "Hebrew", "עברית")
+    into a code like "ES", "ES-AR" or "HE". The region comes from the text itself
+    or, failing that, from the market. Unknown languages fall back to English.
+    """
+    text = (language or "").strip().lower().replace("_", "-")
+    region = ""
+
+    # Keyboard button form: "Native Language (Spanish)"
+    if text.startswith("native language (") and text.endswith(")"):
+        text = text[len("native language ("):-1].strip()
+
+    # "Spanish (Argentina)" / "es-AR"
+    if "(" in text:
+        text, _, rest = text.partition("(")
+        region = REGION_ALIASES.get(rest.rstrip(")").strip(), "")
+        text = text.strip()
+    elif "-" in text:
+        head, _, tail = text.partition("-")
+        if head in LANGUAGE_ALIASES:
+            # Keep the tail only if it is a region ("es-AR", "es-419"), not e.g. "spanish-speaking"
+            tail = tail.strip()
+            text = head
+            region = REGION_ALIASES.get(tail) or (tail.upper() if re.fullmatch(r"[a-z]{2}|\d{3}", tail) else "")
+
+    base = LANGUAGE_ALIASES.get(text)
+    if base is None:
+        # Fall back to whole-word matching ("spanish for latam", "Spanish, please")
+        for word in re.findall(r"\w+", text):
+            if word in LANGUAGE_NAMES:
+                base = LANGUAGE_NAMES[word]
+                break
+    if base is None:
+        return DEFAULT_LANGUAGE_CODE
+
+    if not region:
+        region = REGION_ALIASES.get((market or "").strip().lower(), "")
+    return f"{base}-{region}" if region else base
+
+
+def _parse_pack(pack: Dict[str, Any]) -> List[Tuple[Tuple[str, str, str, str], Tuple[Tuple[str, ...], bool]]]:
+    """
+    Validates one pack and returns its (index key, entry) pairs.
+    Raises KeyError/TypeError/ValueError on malformed packs.
+    """
+    if not isinstance(pack, dict):
+        raise TypeError("pack must be a JSON object")
+    code = pack["language"].strip().upper().replace("_", "-")
+    base, _, region = code.partition("-")
+    if base not in KNOWN_LANGUAGE_CODES:
+        raise ValueError(f"unknown language code {base!r} (add it to LANGUAGE_ALIASES)")
+    region = (pack.get("region") or region).strip().upper()
+    rtl = bool(pack.get("rtl", False))
+
+    entries = []
+    for dialog in pack["dialogs"]:
+        if not isinstance(dialog["lines"], list):
+            raise TypeError("dialog lines must be a list")
+        lines = tuple(dialog["lines"])
+        if not lines or not all(isinstance(line, str) for line in lines):
+            raise ValueError("dialog lines must be a non-empty list of strings")
+        for line in lines:
+            # Formatter.parse raises ValueError on stray braces
+            for _, field, spec, conversion in Formatter().parse(line):
+                if field is not None and (field not in PLACEHOLDERS or spec or conversion):
+                    raise ValueError(f"unsupported placeholder {{{field}}} in {line!r}")
+        tone = dialog.get("tone", "").lower()
+        positions = dialog.get("positions") or list(POSITIONS)
+        for position in positions:
+            if position not in POSITIONS:
+                raise ValueError(f"unknown clip position {position!r}")
+            entries.append(((base, region, position, ""), (lines, rtl)))
+            if tone:
+                entries.append(((base, region, position, tone), (lines, rtl)))
+    return entries
+
+
+def load_dialog_packs(packs_dir: str = DIALOG_PACKS_DIR) -> DialogIndex:
+    """
+    Loads every *.json pack in packs_dir into an index keyed by
+    (language, region, position, tone). Each dialog is also added under the
+    tone-less key so callers that don't care about tone get the full pool.
+    Malformed packs are logged and skipped as a whole.
+    """
+    index: DialogIndex = {}
+    if not os.path.isdir(packs_dir):
+        logger.warning(f"Dialog packs directory not found: {packs_dir}; prompts will have no example lines.")
+        return index
+
+    for filename in sorted(os.listdir(packs_dir)):
+        if not filename.endswith(".json"):
+            continue
+        path = os.path.join(packs_dir, filename)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = _parse_pack(json.load(f))
+        except KeyError as e:
+            logger.error(f"Skipping dialog pack {filename}: missing key {e}")
+            continue
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            logger.error(f"Skipping dialog pack {filename}: {e}")
+            continue
+
+        for key, entry in entries:
+            index.setdefault(key, []).append(entry)
+
+    if index:
+        logger.info(f"Loaded {len(index)} dialog pools from {packs_dir}.")
+    else:
+        logger.warning(f"No usable dialog packs in {packs_dir}; prompts will have no example lines.")
+    return index
+
+
+def clip_position(clip_index: int, clip_count: int) -> str:
+    """Maps a 0-based clip index to its position tag."""
+    if clip_index == 0:
+        return "opening"
+    if clip_index == clip_count - 1:
+        return "closing"
+    return "middle"
+
+
+def infer_tone(*texts: str) -> str:
+    """Guesses a dialog tone from free text (style, scene concept, clip focus). Defaults to casual."""
+    text = " ".join(t for t in texts if t).lower()
+    for tone, keywords in TONE_KEYWORDS.items():
+        if any(re.search(rf"\b{re.escape(k)}", text) for k in keywords):
+            return tone
+    return "casual"
+
+
+def _render_line(line: str, brand: str, market: str, rtl: bool) -> str:
+    if rtl:
+        brand, market = f"{LRI}{brand}{PDI}", f"{LRI}{market}{PDI}"
+        return f'{RLI}"{line.format(brand=brand, market=market)}"{PDI}'
+    return f'"{line.format(brand=brand, market=market)}"'
+
+
+def select_dialog(
+    index: DialogIndex,
+    language_code: str,
+    brand: str,
+    market: str,
+    position: str = "middle",
+    tone: str = "",
+) -> List[str]:
+    """
+    Picks one dialog for a clip. Tries the exact locale, then the base
+    language, then English; within each, the requested tone before any tone.
+    Every lookup is a single dict access, so cost doesn't grow with pack size.
+    """
+    base, _, region = language_code.upper().partition("-")
+    tone = tone.lower()
+    candidates = [(base, region), (base, ""), (DEFAULT_LANGUAGE_CODE, "")]
+    for code, reg in candidates:
+        for t in (tone, "") if tone else ("",):
+            pool = index.get((code, reg, position, t))
+            if pool:
+                lines, rtl = random.choice(pool)
+                return [_render_line(line, brand, market, rtl) for line in lines]
+    return []
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from dialog_packs import (
+    LRI,
+    PDI,
+    RLI,
+    infer_tone,
+    load_dialog_packs,
+    normalize_language_code,
+    select_dialog,
+)
+
+
+def write_pack(directory, name, pack):
+    (directory / name).write_text(json.dumps(pack, ensure_ascii=False), encoding="utf-8")
+
+
+def pack(language, *lines, **extra):
+    return {"language": language, "dialogs": [{"lines": list(lines)}], **extra}
+
+
+@pytest.mark.parametrize(
+    "language, market, expected",
+    [
+        ("es_AR", "", "ES-AR"),
+        ("Spanish (Argentina)", "", "ES-AR"),
+        ("Spanish", "argentina", "ES-AR"),
+        ("Spanish, please", "", "ES"),
+        ("Native Language (Spanish)", "peru", "ES-PE"),
+        ("עברית", "", "HE"),
+        ("Hebrew", "", "HE"),
+        ("Spanish-speaking", "argentina", "ES-AR"),
+        ("es-419", "", "ES-419"),
+        ("French por favor", "", "EN"),
+        ("the language he speaks", "south africa", "EN"),
+        ("Lo que se habla en Argentina", "", "EN"),
+        ("Klingon", "", "EN"),
+        ("", "", "EN"),
+    ],
+)
+def test_normalize_language_code(language, market, expected):
+    assert normalize_language_code(language, market) == expected
+
+
+@pytest.mark.parametrize(
+    "texts, expected",
+    [
+        (("UGC selfie", "Natural fan reaction"), "excited"),
+        (("a clear call to action inviting the viewer to download",), "urgent"),
+        (("spectacular clean banner",), "casual"),
+    ],
+)
+def test_infer_tone(texts, expected):
+    assert infer_tone(*texts) == expected
+
+
+def test_shipped_packs_load():
+    index = load_dialog_packs()
+    for code in ("EN", "ES", "HE", "PT"):
+        assert index[(code, "", "opening", "")]
+    assert index[("ES", "AR", "closing", "urgent")]
+
+
+def test_select_falls_back_locale_then_base_then_english(tmp_path):
+    write_pack(tmp_path, "en.json", pack("EN", "hello {brand}"))
+    write_pack(tmp_path, "es.json", pack("ES", "hola {brand}"))
+    write_pack(tmp_path, "es-ar.json", pack("ES", "che {brand}", region="AR"))
+    index = load_dialog_packs(str(tmp_path))
+
+    assert select_dialog(index, "ES-AR", "b", "m", "opening") == ['"che b"']
+    assert select_dialog(index, "ES-PE", "b", "m", "opening") == ['"hola b"']
+    assert select_dialog(index, "PT-BR", "b", "m", "opening") == ['"hello b"']
+
+
+def test_select_prefers_requested_tone(tmp_path):
+    write_pack(tmp_path, "en.json", {
+        "language": "EN",
+        "dialogs": [
+            {"tone": "casual", "lines": ["relax"]},
+            {"tone": "urgent", "lines": ["hurry"]},
+        ],
+    })
+    index = load_dialog_packs(str(tmp_path))
+
+    assert select_dialog(index, "EN", "b", "m", "closing", "urgent") == ['"hurry"']
+    assert select_dialog(index, "EN", "b", "m", "closing", "excited")[0] in ('"relax"', '"hurry"')
+
+
+def test_locale_in_language_field_is_reachable(tmp_path):
+    write_pack(tmp_path, "es-mx.json", pack("es-MX", "órale {brand}"))
+    index = load_dialog_packs(str(tmp_path))
+
+    assert ("ES", "MX", "opening", "") in index
+    assert select_dialog(index, "ES-MX", "b", "m", "opening") == ['"órale b"']
+
+
+def test_rtl_lines_are_isolated(tmp_path):
+    write_pack(tmp_path, "he.json", pack("HE", "וואו, {brand} ב-{market}", rtl=True))
+    index = load_dialog_packs(str(tmp_path))
+
+    [line] = select_dialog(index, "HE", "betsson", "Israel", "middle")
+    assert line == f'{RLI}"וואו, {LRI}betsson{PDI} ב-{LRI}Israel{PDI}"{PDI}'
+
+
+def test_empty_index_warns_and_selects_nothing(tmp_path, caplog):
+    write_pack(tmp_path, "bad.json", {"dialogs": []})
+    index = load_dialog_packs(str(tmp_path))
+
+    assert index == {}
+    assert "No usable dialog packs" in caplog.text
+    assert select_dialog(index, "EN", "b", "m", "opening") == []
+
+
+def test_unknown_language_pack_is_skipped_not_filed_under_english(tmp_path):
+    write_pack(tmp_path, "en.json", pack("EN", "hello"))
+    write_pack(tmp_path, "fr.json", pack("FR", "bonjour"))
+    index = load_dialog_packs(str(tmp_path))
+
+    assert index[("EN", "", "opening", "")] == [(("hello",), False)]
+    assert not any(key[0] == "FR" for key in index)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"dialogs": []}',
+        '{"language": "ES", "dialogs": [{"tone": "casual"}]}',
+        '{"language": "ES", "dialogs": [{"lines": "not a list"}]}',
+        '{"language": "ES", "dialogs": [{"lines": ["hola {who}"]}]}',
+        '{"language": "ES", "dialogs": [{"lines": ["hola {"]}]}',
+        '{"language": "ES", "dialogs": [{"lines": ["hola"], "positions": ["intro"]}]}',
+        '["not", "an", "object"]',
+        "{not json",
+    ],
+)
+def test_malformed_pack_is_skipped(tmp_path, content):
+    write_pack(tmp_path, "en.json", pack("EN", "hello"))
+    (tmp_path / "bad.json").write_text(content, encoding="utf-8")
+    index = load_dialog_packs(str(tmp_path))
+
+    assert sorted({key[:2] for key in index}) == [("EN", "")]